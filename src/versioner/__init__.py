@@ -19,29 +19,30 @@ Command-line usage:
     $ versioner all                # Do both operations
 """
 
-import argparse
 import sys
 from pathlib import Path
 
 # Public API exports
 from .table_namer import format_table_name, format_full_table_path
-from .version_reader import get_project_version, VersionNotFoundError
-from .notebook_versioner import (
-    version_all_notebooks,
-    version_notebook,
-    print_version_results,
-)
-from .yaml_updater import (
-    update_databricks_yaml,
-    update_variables_yaml,
-    update_all_yaml_files,
-    YAMLUpdateError,
-)
+from .version_reader import get_project_version, clear_version_cache, VersionNotFoundError
+
+# Exports resolved on first access (PEP 562) so `import versioner` in a
+# notebook doesn't pull in PyYAML just to format table names
+_LAZY_EXPORTS = {
+    'version_all_notebooks': 'notebook_versioner',
+    'version_notebook': 'notebook_versioner',
+    'print_version_results': 'notebook_versioner',
+    'update_databricks_yaml': 'yaml_updater',
+    'update_variables_yaml': 'yaml_updater',
+    'update_all_yaml_files': 'yaml_updater',
+    'YAMLUpdateError': 'yaml_updater',
+}
 
 __all__ = [
     'format_table_name',
     'format_full_table_path',
     'get_project_version',
+    'clear_version_cache',
     'VersionNotFoundError',
     'version_all_notebooks',
     'version_notebook',
@@ -52,8 +53,24 @@ __all__ = [
 ]
 
 
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        import importlib
+        module = importlib.import_module(f".{_LAZY_EXPORTS[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
+
 def cmd_notebooks(args) -> int:
     """Command handler for versioning notebooks."""
+    from .notebook_versioner import version_all_notebooks, print_version_results
+
     try:
         print(f"Searching for notebooks in: {Path.cwd()}")
         results = version_all_notebooks(dry_run=args.dry_run)
@@ -76,6 +93,8 @@ def cmd_notebooks(args) -> int:
 
 def cmd_update_yaml(args) -> int:
     """Command handler for updating Databricks YAML files."""
+    from .yaml_updater import update_all_yaml_files
+
     try:
         results = update_all_yaml_files(
             create_backup_file=not args.no_backup,
@@ -127,25 +146,8 @@ def cmd_version(args) -> int:
     return 0
 
 
-def main() -> None:
-    """Main entry point for the versioner CLI."""
-    parser = argparse.ArgumentParser(
-        prog='versioner',
-        description='Version management tool for notebooks and Databricks assets',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  versioner notebooks              Version all Jupyter notebooks
-  versioner notebooks --dry-run    Preview notebook versioning changes
-  versioner update-yaml            Update version in databricks.yml and resources/variables.yml
-  versioner all                    Version notebooks and update YAML files
-  versioner version                Show version information
-        """
-    )
-
-    subparsers = parser.add_subparsers(dest='command', help='Command to run')
-
-    # Notebooks command
+def _add_notebooks_parser(subparsers) -> None:
+    """Register the `notebooks` subcommand."""
     notebooks_parser = subparsers.add_parser(
         'notebooks',
         help='Version all Jupyter notebooks in the project'
@@ -157,7 +159,9 @@ Examples:
     )
     notebooks_parser.set_defaults(func=cmd_notebooks)
 
-    # Update YAML command
+
+def _add_update_yaml_parser(subparsers) -> None:
+    """Register the `update-yaml` subcommand."""
     yaml_parser = subparsers.add_parser(
         'update-yaml',
         help='Update version in databricks.yml and resources/variables.yml'
@@ -174,7 +178,9 @@ Examples:
     )
     yaml_parser.set_defaults(func=cmd_update_yaml)
 
-    # All command
+
+def _add_all_parser(subparsers) -> None:
+    """Register the `all` subcommand."""
     all_parser = subparsers.add_parser(
         'all',
         help='Run all versioning operations (notebooks + YAML)'
@@ -191,14 +197,58 @@ Examples:
     )
     all_parser.set_defaults(func=cmd_all)
 
-    # Version command
+
+def _add_version_parser(subparsers) -> None:
+    """Register the `version` subcommand."""
     version_parser = subparsers.add_parser(
         'version',
         help='Show version information'
     )
     version_parser.set_defaults(func=cmd_version)
 
-    args = parser.parse_args()
+
+_SUBPARSERS = {
+    'notebooks': _add_notebooks_parser,
+    'update-yaml': _add_update_yaml_parser,
+    'all': _add_all_parser,
+    'version': _add_version_parser,
+}
+
+
+def main() -> None:
+    """Main entry point for the versioner CLI."""
+    argv = sys.argv[1:]
+
+    # `versioner version` takes no options, so answer it without argparse
+    if argv == ['version']:
+        sys.exit(cmd_version(None))
+
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='versioner',
+        description='Version management tool for notebooks and Databricks assets',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  versioner notebooks              Version all Jupyter notebooks
+  versioner notebooks --dry-run    Preview notebook versioning changes
+  versioner update-yaml            Update version in databricks.yml and resources/variables.yml
+  versioner all                    Version notebooks and update YAML files
+  versioner version                Show version information
+        """
+    )
+
+    subparsers = parser.add_subparsers(dest='command', help='Command to run')
+
+    # Only register the requested subcommand; top-level help and errors need all
+    if argv and argv[0] in _SUBPARSERS:
+        _SUBPARSERS[argv[0]](subparsers)
+    else:
+        for add_parser in _SUBPARSERS.values():
+            add_parser(subparsers)
+
+    args = parser.parse_args(argv)
 
     if not args.command:
         parser.print_help()
@@ -1,12 +1,28 @@
 """Module for versioning Jupyter notebooks."""
 
+import os
 import re
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 
 from .version_reader import get_project_version
 
-VERSION_PATTERN = re.compile(r"_v(\d+\.\d+\.\d+)\.ipynb$")
+NOTEBOOK_SUFFIX = ".ipynb"
+VERSION_PATTERN = re.compile(r"(.*?)_v(\d+\.\d+\.\d+)\.ipynb", re.ASCII | re.DOTALL)
+
+_SUFFIX_LEN = len(NOTEBOOK_SUFFIX)
+
+# Directories that never contain project notebooks worth versioning
+_SKIP_DIRS = frozenset({
+    '.git',
+    '.ipynb_checkpoints',
+    'node_modules',
+    '.venv',
+    'venv',
+    '__pycache__',
+    '.tox',
+    '.mypy_cache',
+})
 
 
 def parse_notebook_name(notebook_path: Path) -> Tuple[str, Optional[str]]:
@@ -31,15 +47,13 @@ def parse_notebook_name(notebook_path: Path) -> Tuple[str, Optional[str]]:
     """
     filename = notebook_path.name
 
-    match = VERSION_PATTERN.search(filename)
+    match = VERSION_PATTERN.fullmatch(filename)
     if match:
-        version = match.group(1)
-        base_name = filename[: match.start()]
-        return base_name, version
+        return match.group(1), match.group(2)
 
     # No version found - remove .ipynb extension for base name
-    if filename.endswith(".ipynb"):
-        base_name = filename[:-6]
+    if filename.endswith(NOTEBOOK_SUFFIX):
+        base_name = filename[:-_SUFFIX_LEN]
         return base_name, None
 
     return filename, None
@@ -63,10 +77,54 @@ def create_versioned_name(base_name: str, version: str) -> str:
     return f"{base_name}_v{version}.ipynb"
 
 
+def _scan_notebooks(dirpath: str) -> Iterator[Path]:
+    """Walk a directory with os.scandir, yielding notebooks and pruning _SKIP_DIRS."""
+    # List each directory up front so renames made by the consumer while the
+    # walk is suspended can't surface the renamed file a second time
+    try:
+        with os.scandir(dirpath) as it:
+            entries = list(it)
+    except OSError:
+        # Unreadable or vanished directories are skipped, as Path.rglob did
+        return
+
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name in _SKIP_DIRS:
+                continue
+            yield from _scan_notebooks(entry.path)
+        elif entry.name.endswith(NOTEBOOK_SUFFIX):
+            yield Path(entry.path)
+
+
+def iter_notebooks(root_dir: Optional[Path] = None) -> Iterator[Path]:
+    """
+    Lazily yield all Jupyter notebooks in a directory tree.
+
+    VCS metadata, virtualenvs, caches and .ipynb_checkpoints are skipped.
+
+    Args:
+        root_dir: Directory to search. Defaults to current working directory.
+
+    Yields:
+        Paths to .ipynb files, as they are discovered
+
+    Examples:
+        >>> for notebook in iter_notebooks():
+        ...     print(notebook.name)
+    """
+    if root_dir is None:
+        root_dir = Path.cwd()
+
+    return _scan_notebooks(str(root_dir))
+
+
 def find_notebooks(root_dir: Optional[Path] = None) -> List[Path]:
     """
     Recursively find all Jupyter notebooks in a directory.
 
+    Eager wrapper around iter_notebooks.
+
     Args:
         root_dir: Directory to search. Defaults to current working directory.
 
@@ -77,10 +135,7 @@ def find_notebooks(root_dir: Optional[Path] = None) -> List[Path]:
         >>> notebooks = find_notebooks()
         >>> print(f"Found {len(notebooks)} notebooks")
     """
-    if root_dir is None:
-        root_dir = Path.cwd()
-
-    return list(root_dir.rglob("*.ipynb"))
+    return list(iter_notebooks(root_dir))
 
 
 def version_notebook(
@@ -107,29 +162,41 @@ def version_notebook(
         >>> print(msg)
         'Versioned: analysis.ipynb -> analysis_v0.1.0.ipynb'
     """
-    base_name, current_version = parse_notebook_name(notebook_path)
+    filename = notebook_path.name
 
-    if current_version == target_version:
-        return False, None, f"Already at version {target_version}: {notebook_path.name}"
+    # Plain string check first: re-runs mostly see notebooks that are current
+    if filename.endswith(create_versioned_name("", target_version)):
+        return False, None, f"Already at version {target_version}: {filename}"
+
+    base_name, current_version = parse_notebook_name(notebook_path)
 
     new_name = create_versioned_name(base_name, target_version)
-    new_path = notebook_path.parent / new_name
 
-    if new_path.exists() and new_path != notebook_path:
+    # Plain string paths avoid Path allocations when renaming many notebooks;
+    # new_name always differs from filename once the suffix check has passed
+    notebook_str = str(notebook_path)
+    new_path_str = os.path.join(os.path.dirname(notebook_str), new_name)
+
+    if os.path.exists(new_path_str):
         return False, None, f"Error: Target file already exists: {new_name}"
 
     action = "Would rename" if dry_run else "Renamed"
     if current_version:
         message = (
-            f"{action}: {notebook_path.name} -> {new_name} (from v{current_version})"
+            f"{action}: {filename} -> {new_name} (from v{current_version})"
         )
     else:
-        message = f"{action}: {notebook_path.name} -> {new_name} (added version)"
+        message = f"{action}: {filename} -> {new_name} (added version)"
 
-    if not dry_run and new_path != notebook_path:
-        notebook_path.rename(new_path)
+    if not dry_run:
+        # Report a failed rename as a result rather than raising, so notebooks
+        # already renamed earlier in the walk still appear in the summary
+        try:
+            os.rename(notebook_str, new_path_str)
+        except OSError as e:
+            return False, None, f"Error: Could not rename {filename}: {e.strerror or e}"
 
-    return True, new_path, message
+    return True, Path(new_path_str), message
 
 
 def version_all_notebooks(
@@ -163,10 +230,9 @@ def version_all_notebooks(
     if target_version is None:
         target_version = get_project_version(root_dir)
 
-    notebooks = find_notebooks(root_dir)
     results = []
 
-    for notebook in notebooks:
+    for notebook in iter_notebooks(root_dir):
         result = version_notebook(notebook, target_version, dry_run)
         results.append(result)
 
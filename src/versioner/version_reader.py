@@ -1,9 +1,16 @@
 """Module for reading version information from target projects."""
 
 import ast
+import functools
 import re
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
+
+# Top-level __version__ assignments; tried before falling back to AST parsing
+_VERSION_PATTERNS = (
+    re.compile(r'^__version__\s*=\s*["\']([^"\']+)["\']', re.M),
+    re.compile(r'^__version__\s*:\s*str\s*=\s*["\']([^"\']+)["\']', re.M),
+)
 
 
 class VersionNotFoundError(Exception):
@@ -16,10 +23,13 @@ def find_version_file(start_path: Optional[Path] = None) -> Path:
     Locate the __version__.py file in the project.
 
     Searches in the following order:
-    1. Current directory (__version__.py)
+    1. Start directory (__version__.py)
     2. src/ directory (src/__version__.py)
     3. Any package directory in src/ (src/<package>/__version__.py)
-    4. Parent directory (../__version__.py)
+    4. Each parent directory up to the filesystem root (../__version__.py)
+
+    Results are cached per directory, so lookups from sibling directories
+    share the work done for their common parents.
 
     Args:
         start_path: Directory to start searching from. Defaults to current working directory.
@@ -33,30 +43,68 @@ def find_version_file(start_path: Optional[Path] = None) -> Path:
     if start_path is None:
         start_path = Path.cwd()
 
+    start_path = start_path.resolve()
+
+    try:
+        return Path(_find_version_file_cached(str(start_path)))
+    except VersionNotFoundError:
+        raise VersionNotFoundError(
+            f"Could not find __version__.py file. Searched locations:\n"
+            f"  - {start_path / '__version__.py'}\n"
+            f"  - {start_path / 'src' / '__version__.py'}\n"
+            f"  - {start_path / 'src' / '<package>' / '__version__.py'}\n"
+            f"  - __version__.py in each parent directory of {start_path}"
+        ) from None
+
+
+@functools.lru_cache(maxsize=16)
+def _find_version_file_cached(directory: str) -> str:
+    """
+    Search a directory, its src/ packages and its parents for __version__.py.
+
+    Failure is raised rather than returned so lru_cache never stores it, and a
+    __version__.py created later in the session is still found.
+    """
+    path = Path(directory)
+
     search_locations = [
-        start_path / "__version__.py",
-        start_path / "src" / "__version__.py",
+        path / "__version__.py",
+        path / "src" / "__version__.py",
     ]
 
     # Check for package directories in src/
-    src_dir = start_path / "src"
+    src_dir = path / "src"
     if src_dir.exists():
         for item in src_dir.iterdir():
             if item.is_dir() and not item.name.startswith('.'):
                 version_file = item / "__version__.py"
                 search_locations.append(version_file)
 
-    # Check parent directory
-    search_locations.append(start_path.parent / "__version__.py")
-
     for location in search_locations:
         if location.exists():
-            return location
+            return str(location)
 
-    raise VersionNotFoundError(
-        f"Could not find __version__.py file. Searched locations:\n"
-        + "\n".join(f"  - {loc}" for loc in search_locations)
-    )
+    return _find_parent_version_file_cached(str(path.parent))
+
+
+@functools.lru_cache(maxsize=32)
+def _find_parent_version_file_cached(directory: str) -> str:
+    """
+    Search a directory and its parents for a bare __version__.py, memoized per directory.
+
+    Ancestors' src/ trees are deliberately not searched, so an unrelated
+    project under e.g. ~/src is never picked up.
+    """
+    path = Path(directory)
+
+    version_file = path / "__version__.py"
+    if version_file.exists():
+        return str(version_file)
+
+    if path.parent == path:
+        raise VersionNotFoundError(f"Could not find __version__.py file above {directory}")
+
+    return _find_parent_version_file_cached(str(path.parent))
 
 
 def parse_version_from_file(version_file: Path) -> str:
@@ -75,14 +123,57 @@ def parse_version_from_file(version_file: Path) -> str:
         Version string (e.g., "0.1.0")
 
     Raises:
-        VersionNotFoundError: If version cannot be parsed from file
+        VersionNotFoundError: If the file no longer exists or version cannot be parsed
     """
-    content = version_file.read_text()
+    try:
+        mtime_ns = version_file.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise VersionNotFoundError(f"Could not find __version__.py file: {version_file}") from None
+
+    # Keyed on mtime so edits to __version__.py are picked up within a session
+    return _parse_version_cached(str(version_file), mtime_ns)
 
-    # Try using AST parsing (most robust)
+
+def _module_level_statements(tree: ast.Module) -> Iterator[ast.stmt]:
+    """
+    Yield statements that run at import time, breadth-first.
+
+    Covers top-level statements and those nested in top-level if/try blocks
+    (e.g. a version set in a try/except ImportError), without descending into
+    function or class bodies.
+    """
+    pending = list(tree.body)
+    while pending:
+        yield from pending
+
+        nested = []
+        for node in pending:
+            if isinstance(node, ast.If):
+                nested += node.body + node.orelse
+            elif isinstance(node, (ast.Try, ast.TryStar)):
+                nested += node.body
+                for handler in node.handlers:
+                    nested += handler.body
+                nested += node.orelse + node.finalbody
+        pending = nested
+
+
+@functools.lru_cache(maxsize=16)
+def _parse_version_cached(version_file: str, mtime_ns: int) -> str:
+    """Parse a __version__.py file, memoized per (path, mtime)."""
+    content = Path(version_file).read_text()
+
+    # Fast path: the documented formats are matched without building an AST.
+    # More than one match means a line may sit inside a docstring or other
+    # string, so leave those to the AST
+    matches = [version for pattern in _VERSION_PATTERNS for version in pattern.findall(content)]
+    if len(matches) == 1:
+        return matches[0]
+
+    # Fall back to AST parsing of module-level statements for less conventional layouts
     try:
         tree = ast.parse(content)
-        for node in ast.walk(tree):
+        for node in _module_level_statements(tree):
             if isinstance(node, ast.Assign):
                 for target in node.targets:
                     if isinstance(target, ast.Name) and target.id == '__version__':
@@ -95,17 +186,6 @@ def parse_version_from_file(version_file: Path) -> str:
     except SyntaxError:
         pass
 
-    # Fallback to regex parsing
-    patterns = [
-        r'__version__\s*=\s*["\']([^"\']+)["\']',
-        r'__version__\s*:\s*str\s*=\s*["\']([^"\']+)["\']',
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, content)
-        if match:
-            return match.group(1)
-
     raise VersionNotFoundError(
         f"Could not parse version from {version_file}. "
         "Expected format: __version__ = \"x.y.z\""
@@ -117,6 +197,8 @@ def get_project_version(start_path: Optional[Path] = None) -> str:
     Get the current project version from __version__.py.
 
     This is the main function to use for retrieving version information.
+    The file location is cached per start directory and the parsed version
+    per file modification time, so repeated calls avoid filesystem scans.
 
     Args:
         start_path: Directory to start searching from. Defaults to current working directory.
@@ -133,4 +215,24 @@ def get_project_version(start_path: Optional[Path] = None) -> str:
         Current version: 0.1.0
     """
     version_file = find_version_file(start_path)
-    return parse_version_from_file(version_file)
+    try:
+        return parse_version_from_file(version_file)
+    except VersionNotFoundError:
+        if version_file.exists():
+            raise
+
+    # The cached location was moved or deleted; search again once
+    _find_version_file_cached.cache_clear()
+    _find_parent_version_file_cached.cache_clear()
+    return parse_version_from_file(find_version_file(start_path))
+
+
+def clear_version_cache() -> None:
+    """
+    Clear the cached __version__.py locations and parsed versions.
+
+    Mainly useful in tests that create, move or rewrite __version__.py files.
+    """
+    _find_version_file_cached.cache_clear()
+    _find_parent_version_file_cached.cache_clear()
+    _parse_version_cached.cache_clear()
@@ -1,12 +1,34 @@
 """Module for updating Databricks asset bundle YAML files with version information."""
 
+import os
+import re
 import shutil
+import tempfile
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 import yaml
 
 from .version_reader import get_project_version
 
+# Prefer the LibYAML C bindings when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+# Top-level `version: x.y.z` line in databricks.yml (optionally quoted/commented)
+_VERSION_RE = re.compile(
+    r'^(version:[ \t]*)(["\']?)([\w.+-]+)(\2)([^\S\n]*(?:#.*)?)$', re.M
+)
+
+# `default: x.y.z` line nested under variables.pkg_version in variables.yml
+_DEFAULT_RE = re.compile(
+    r'^([ \t]+default:[ \t]*)(["\']?)([\w.+-]+)(\2)([^\S\n]*(?:#.*)?)$'
+)
+
+# Block mapping key with no inline value, e.g. `pkg_version:`
+_MAPPING_KEY_RE = re.compile(r'^([\w.-]+):[^\S\n]*(?:#.*)?$')
+
 
 class YAMLUpdateError(Exception):
     """Raised when YAML file cannot be updated."""
@@ -44,6 +66,11 @@ def create_backup(yaml_path: Path) -> Path:
     """
     Create a backup of the YAML file.
 
+    The backup is a hard link where the filesystem allows it, falling back to
+    a full copy otherwise. Because a hard link shares its contents with the
+    original, the original must be replaced (see write_yaml_text) rather than
+    modified in place afterwards.
+
     Args:
         yaml_path: Path to the YAML file to backup
 
@@ -56,10 +83,90 @@ def create_backup(yaml_path: Path) -> Path:
         PosixPath('databricks.yml.bak')
     """
     backup_path = yaml_path.with_suffix('.yml.bak')
-    shutil.copy2(yaml_path, backup_path)
+    backup_path.unlink(missing_ok=True)
+    try:
+        # Link the resolved file; linking a symlink would just duplicate the link
+        os.link(os.path.realpath(yaml_path), backup_path)
+    except OSError:
+        # Cross-device, unsupported filesystem, or no hard link permission
+        shutil.copy2(yaml_path, backup_path)
     return backup_path
 
 
+def write_yaml_text(yaml_path: Path, text: str) -> None:
+    """
+    Atomically replace the contents of a YAML file.
+
+    The text is written to a temporary file in the same directory and moved
+    over the original, so a crash never leaves a partially written file and
+    any hard-linked backup keeps the previous contents. Symlinks are resolved
+    first so the link's target is updated rather than the link replaced.
+
+    Args:
+        yaml_path: Path to the YAML file to write
+        text: New file contents
+    """
+    target = Path(os.path.realpath(yaml_path))
+
+    tmp_file = tempfile.NamedTemporaryFile(
+        'w', dir=target.parent, prefix=f".{target.name}.", suffix='.tmp', delete=False
+    )
+    tmp_path = Path(tmp_file.name)
+
+    try:
+        with tmp_file:
+            tmp_file.write(text)
+        shutil.copymode(target, tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _is_block_document(lines: list[str]) -> bool:
+    """
+    Check whether a YAML document is a block mapping that keys can be appended to.
+
+    Args:
+        lines: File content split into lines
+
+    Returns:
+        False if the top level is a flow collection, e.g. `{bundle: ...}`, is
+        indented, starts on the `---` marker line, or the file has a `...` end
+        marker or a further document; True otherwise
+    """
+    seen_content = False
+    for line in lines:
+        if line.startswith('...') or (seen_content and line.startswith('---')):
+            return False
+
+        content = line.strip()
+        if seen_content or not content or content.startswith(('#', '%')) or content == '---':
+            continue
+        if line[0].isspace() or content.startswith(('{', '[', '---')):
+            return False
+        seen_content = True
+
+    return True
+
+
+def _loads_as(text: str, expected: object) -> bool:
+    """
+    Check that spliced YAML text parses to the expected document.
+
+    Args:
+        text: Candidate file content
+        expected: Document the text should load as
+
+    Returns:
+        True if the text loads and equals expected, False otherwise
+    """
+    try:
+        return yaml.load(text, Loader=_Loader) == expected
+    except yaml.YAMLError:
+        return False
+
+
 def update_databricks_yaml(
     yaml_path: Optional[Path] = None,
     target_version: Optional[str] = None,
@@ -94,24 +201,54 @@ def update_databricks_yaml(
     if target_version is None:
         target_version = get_project_version(yaml_path.parent)
 
-    # Read the current YAML file
+    text = yaml_path.read_text()
+
+    # Edit only the top-level version line so comments, quoting and key order
+    # are preserved; fall back to a full YAML round-trip if it can't be found
+    # or the match turns out to sit inside a multi-line string
     try:
-        with open(yaml_path, 'r') as f:
-            data = yaml.safe_load(f)
+        match = _VERSION_RE.search(text)
+
+        # Skip the event scan for an already-current, unambiguous version line
+        if match and match.group(3) == target_version and _mentions_key_once(text, 'version'):
+            return False, f"Already at version {target_version}: {yaml_path.name}"
+
+        if match and not _is_value_line(text, ('version',), text.count('\n', 0, match.start())):
+            match = None
+
+        if not match:
+            data = yaml.load(text, Loader=_Loader)
     except yaml.YAMLError as e:
         raise YAMLUpdateError(f"Failed to parse YAML file {yaml_path}: {e}")
 
-    if data is None:
-        data = {}
+    if match:
+        current_version = match.group(3)
+    else:
+        if data is None:
+            data = {}
 
-    # Get current version if it exists
-    current_version = data.get('version')
+        current_version = data.get('version')
 
     if current_version == target_version:
         return False, f"Already at version {target_version}: {yaml_path.name}"
 
     # Update the version
-    data['version'] = target_version
+    if match:
+        new_text = f"{text[:match.start(3)]}{target_version}{text[match.end(3):]}"
+    else:
+        appendable = 'version' not in data and _is_block_document(text.splitlines())
+        data['version'] = target_version
+
+        new_text = None
+        if appendable:
+            new_text = text if not text or text.endswith('\n') else text + '\n'
+            new_text += f"version: {target_version}\n"
+            # Only keep the appended line if the file still loads as intended
+            if not _loads_as(new_text, data):
+                new_text = None
+
+        if new_text is None:
+            new_text = yaml.dump(data, Dumper=_Dumper, default_flow_style=False, sort_keys=False)
 
     action = "Would update" if dry_run else "Updated"
     if current_version:
@@ -127,14 +264,144 @@ def update_databricks_yaml(
 
         # Write updated YAML
         try:
-            with open(yaml_path, 'w') as f:
-                yaml.safe_dump(data, f, default_flow_style=False, sort_keys=False)
+            write_yaml_text(yaml_path, new_text)
         except Exception as e:
             raise YAMLUpdateError(f"Failed to write YAML file {yaml_path}: {e}")
 
     return True, message
 
 
+def _find_scalar_event(
+    source: Union[str, bytes], key_path: Tuple[str, ...]
+) -> Tuple[bool, Optional[yaml.ScalarEvent]]:
+    """
+    Find the scalar event at a mapping key path in the YAML event stream.
+
+    Parsing stops as soon as the value is reached, so the document is never
+    composed into nodes or constructed into Python objects.
+
+    Args:
+        source: Raw YAML content
+        key_path: Mapping keys leading to the value, e.g. ('version',)
+
+    Returns:
+        Tuple of (resolved, event)
+        - resolved: False if events alone can't answer reliably (aliases,
+          merge keys, complex keys, or a non-scalar value at key_path)
+        - event: The value's ScalarEvent, or None if the key is absent
+    """
+    # One entry per open collection: the current key (None for sequences or
+    # before a mapping's first key) and whether the mapping expects a key next
+    path: list[Optional[str]] = []
+    expecting_key: list[Optional[bool]] = []
+
+    events = yaml.parse(source, Loader=_Loader)
+    try:
+        for event in events:
+            if isinstance(event, yaml.DocumentEndEvent):
+                # yaml.load rejects a second document; leave that error to it
+                if isinstance(next(events), yaml.DocumentStartEvent):
+                    return False, None
+                break
+
+            if isinstance(event, yaml.CollectionEndEvent):
+                path.pop()
+                expecting_key.pop()
+                if expecting_key and expecting_key[-1] is False:
+                    expecting_key[-1] = True
+                continue
+
+            if not isinstance(event, yaml.NodeEvent):
+                continue
+
+            if isinstance(event, yaml.AliasEvent):
+                return False, None
+
+            if expecting_key and expecting_key[-1]:
+                if not isinstance(event, yaml.ScalarEvent) or event.value == '<<':
+                    return False, None
+                path[-1] = event.value
+                expecting_key[-1] = False
+                continue
+
+            if tuple(path) == key_path:
+                if not isinstance(event, yaml.ScalarEvent):
+                    return False, None
+                return True, event
+
+            if isinstance(event, yaml.CollectionStartEvent):
+                path.append(None)
+                expecting_key.append(True if isinstance(event, yaml.MappingStartEvent) else None)
+            elif expecting_key and expecting_key[-1] is False:
+                expecting_key[-1] = True
+    finally:
+        events.close()
+
+    return True, None
+
+
+def _scan_scalar(source: Union[str, bytes], key_path: Tuple[str, ...]) -> Tuple[bool, object]:
+    """
+    Look up a scalar's value by its mapping key path using the YAML event stream.
+
+    The value is resolved and constructed the way yaml.load would, so e.g.
+    `version: 1.0` gives the float 1.0. In a multi-document file the value
+    is read from the first document, where yaml.load would raise.
+
+    Args:
+        source: Raw YAML content
+        key_path: Mapping keys leading to the value, e.g. ('version',)
+
+    Returns:
+        Tuple of (resolved, value) as for _find_scalar_event, with the
+        constructed value, or None if absent
+    """
+    resolved, event = _find_scalar_event(source, key_path)
+    if event is None:
+        return resolved, None
+
+    loader = _Loader('')
+    try:
+        tag = event.tag
+        if tag is None or tag == '!':
+            tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+        node = yaml.ScalarNode(tag, event.value, event.start_mark, event.end_mark, event.style)
+        return resolved, loader.construct_object(node)
+    finally:
+        loader.dispose()
+
+
+def _is_value_line(source: str, key_path: Tuple[str, ...], line: int) -> bool:
+    """
+    Check that the scalar at key_path starts on the given line.
+
+    Guards the line-based edits against matching text inside a multi-line
+    quoted scalar or flow collection rather than the real key.
+
+    Args:
+        source: Raw YAML content
+        key_path: Mapping keys leading to the value
+        line: Zero-based line number the regex matched on
+    """
+    resolved, event = _find_scalar_event(source, key_path)
+    return resolved and event is not None and event.start_mark.line == line
+
+
+def _mentions_key_once(source: str, key: str) -> bool:
+    """
+    Check that key appears as a mapping key on exactly one line.
+
+    A cheap preflight for _is_value_line: when the only `key:` in the file
+    is the line a regex matched, no other line can be mistaken for it.
+
+    Args:
+        source: Raw YAML content
+        key: Mapping key to count, e.g. 'version'
+    """
+    pattern = re.compile(rf'(?<![\w.-]){re.escape(key)}[ \t]*:')
+    return len(pattern.findall(source)) == 1
+
+
 def get_databricks_version(yaml_path: Optional[Path] = None) -> Optional[str]:
     """
     Get the current version from a Databricks asset bundle YAML file.
@@ -151,9 +418,15 @@ def get_databricks_version(yaml_path: Optional[Path] = None) -> Optional[str]:
     if yaml_path is None:
         yaml_path = find_databricks_yaml()
 
+    raw = yaml_path.read_bytes()
+
+    # Stop at the version scalar; only build the whole document if that fails
     try:
-        with open(yaml_path, 'r') as f:
-            data = yaml.safe_load(f)
+        resolved, version = _scan_scalar(raw, ('version',))
+        if resolved:
+            return version
+
+        data = yaml.load(raw, Loader=_Loader)
     except yaml.YAMLError as e:
         raise YAMLUpdateError(f"Failed to parse YAML file {yaml_path}: {e}")
 
@@ -190,6 +463,143 @@ def find_variables_yaml(root_dir: Optional[Path] = None) -> Path:
     return yaml_path
 
 
+def _find_block(
+    lines: list[str], key: str, start: int, end: int, indent: int
+) -> Optional[Tuple[int, int, Optional[int]]]:
+    """
+    Find a block-style `key:` mapping entry at a given indentation.
+
+    Args:
+        lines: File content split with keepends=True
+        key: Mapping key to look for
+        start: First line index to search
+        end: Line index to stop searching at
+        indent: Indentation of the key, in spaces
+
+    Returns:
+        Tuple of (header index, end of block index, child indentation), or
+        None if the key is not present as a plain block mapping header.
+        Child indentation is None when the block has no children.
+    """
+    for header in range(start, end):
+        content = lines[header].strip()
+        if not content or content.startswith('#'):
+            continue
+        if len(lines[header]) - len(lines[header].lstrip()) != indent:
+            continue
+
+        key_match = _MAPPING_KEY_RE.match(content)
+        if not key_match or key_match.group(1) != key:
+            continue
+
+        block_end = header + 1
+        child_indent = None
+        for index in range(header + 1, end):
+            line = lines[index]
+            content = line.strip()
+            if not content or content.startswith('#'):
+                continue
+            line_indent = len(line) - len(line.lstrip())
+            if line_indent <= indent:
+                break
+            if child_indent is None:
+                child_indent = line_indent
+            block_end = index + 1
+
+        return header, block_end, child_indent
+
+    return None
+
+
+def _find_pkg_version_default(lines: list[str]) -> Optional[Tuple[int, re.Match]]:
+    """
+    Locate the variables.pkg_version.default line in variables.yml content.
+
+    Only plain block mappings with an unquoted or simply quoted scalar are
+    recognised; anything else (flow mappings, anchors, multi-line scalars)
+    returns None so the caller can fall back to a full YAML parse.
+
+    Args:
+        lines: File content split with keepends=True
+
+    Returns:
+        Tuple of (line index, match of the default line), or None if not found
+    """
+    variables = _find_block(lines, 'variables', 0, len(lines), 0)
+    if variables is None or variables[2] is None:
+        return None
+
+    header, end, indent = variables
+    pkg_version = _find_block(lines, 'pkg_version', header + 1, end, indent)
+    if pkg_version is None or pkg_version[2] is None:
+        return None
+
+    header, end, indent = pkg_version
+    for index in range(header + 1, end):
+        line = lines[index]
+        if len(line) - len(line.lstrip()) == indent and line.lstrip().startswith('default:'):
+            match = _DEFAULT_RE.match(line)
+            return (index, match) if match else None
+
+    return None
+
+
+def _insert_pkg_version_default(
+    lines: list[str], data: dict, target_version: str
+) -> Optional[str]:
+    """
+    Splice a missing variables.pkg_version.default entry into variables.yml.
+
+    The parsed document is used to confirm which keys are absent; the new
+    entry is then inserted as text so the rest of the file is left untouched.
+
+    Args:
+        lines: File content split with keepends=True
+        data: Parsed YAML document
+        target_version: Version to set
+
+    Returns:
+        Updated file content, or None if the entry already exists or the
+        insertion point cannot be determined (e.g. flow-style mappings)
+    """
+    lines = list(lines)
+    if lines and not lines[-1].endswith('\n'):
+        lines[-1] += '\n'
+
+    if 'variables' not in data:
+        if not _is_block_document(lines):
+            return None
+        lines.append(f"variables:\n  pkg_version:\n    default: {target_version}\n")
+        return ''.join(lines)
+
+    variables = data['variables']
+    if variables is not None and not isinstance(variables, dict):
+        return None
+
+    block = _find_block(lines, 'variables', 0, len(lines), 0)
+    if block is None:
+        return None
+
+    header, end, step = block
+    step = step or 2
+
+    if not variables or 'pkg_version' not in variables:
+        lines.insert(end, f"{' ' * step}pkg_version:\n{' ' * step * 2}default: {target_version}\n")
+        return ''.join(lines)
+
+    pkg_version = variables['pkg_version']
+    if pkg_version is not None and (not isinstance(pkg_version, dict) or 'default' in pkg_version):
+        return None
+
+    block = _find_block(lines, 'pkg_version', header + 1, end, step)
+    if block is None:
+        return None
+
+    _, end, indent = block
+    lines.insert(end, f"{' ' * (indent or step * 2)}default: {target_version}\n")
+    return ''.join(lines)
+
+
 def update_variables_yaml(
     yaml_path: Optional[Path] = None,
     target_version: Optional[str] = None,
@@ -224,32 +634,66 @@ def update_variables_yaml(
     if target_version is None:
         target_version = get_project_version(yaml_path.parent.parent)
 
-    # Read the current YAML file
+    text = yaml_path.read_text()
+    lines = text.splitlines(keepends=True)
+
+    # Edit only the pkg_version.default line when it can be located; fall back
+    # to a full YAML round-trip otherwise, or if the line sits inside a string
     try:
-        with open(yaml_path, 'r') as f:
-            data = yaml.safe_load(f)
+        located = _find_pkg_version_default(lines)
+
+        # Skip the event scan for an already-current, unambiguous default line
+        if (located and located[1].group(3) == target_version
+                and _mentions_key_once(text, 'pkg_version')):
+            return False, f"Already at version {target_version}: {yaml_path}"
+
+        if located and not _is_value_line(text, ('variables', 'pkg_version', 'default'), located[0]):
+            located = None
+
+        if not located:
+            data = yaml.load(text, Loader=_Loader)
     except yaml.YAMLError as e:
         raise YAMLUpdateError(f"Failed to parse YAML file {yaml_path}: {e}")
 
-    if data is None:
-        data = {}
+    if located:
+        index, match = located
+        current_version = match.group(3)
+    else:
+        if data is None:
+            data = {}
 
-    # Ensure variables key exists
-    if 'variables' not in data:
-        data['variables'] = {}
+        # A missing entry can usually be spliced in without re-emitting the file
+        spliced_text = _insert_pkg_version_default(lines, data, target_version)
 
-    # Ensure pkg_version key exists
-    if 'pkg_version' not in data['variables']:
-        data['variables']['pkg_version'] = {}
+        # Ensure variables key exists
+        if data.get('variables') is None:
+            data['variables'] = {}
 
-    # Get current version if it exists
-    current_version = data['variables']['pkg_version'].get('default')
+        # Ensure pkg_version key exists
+        if data['variables'].get('pkg_version') is None:
+            data['variables']['pkg_version'] = {}
+
+        # Get current version if it exists
+        current_version = data['variables']['pkg_version'].get('default')
 
     if current_version == target_version:
         return False, f"Already at version {target_version}: {yaml_path}"
 
     # Update the version
-    data['variables']['pkg_version']['default'] = target_version
+    if located:
+        lines[index] = (
+            f"{match.group(1)}{match.group(2)}{target_version}{match.group(4)}"
+            f"{lines[index][match.end(4):]}"
+        )
+        new_text = ''.join(lines)
+    else:
+        data['variables']['pkg_version']['default'] = target_version
+
+        # Only keep the spliced text if the file still loads as intended
+        if spliced_text is not None and _loads_as(spliced_text, data):
+            new_text = spliced_text
+        else:
+            new_text = yaml.dump(data, Dumper=_Dumper, default_flow_style=False, sort_keys=False)
 
     action = "Would update" if dry_run else "Updated"
     if current_version:
@@ -265,8 +709,7 @@ def update_variables_yaml(
 
         # Write updated YAML
         try:
-            with open(yaml_path, 'w') as f:
-                yaml.safe_dump(data, f, default_flow_style=False, sort_keys=False)
+            write_yaml_text(yaml_path, new_text)
         except Exception as e:
             raise YAMLUpdateError(f"Failed to write YAML file {yaml_path}: {e}")
 
@@ -289,9 +732,15 @@ def get_variables_version(yaml_path: Optional[Path] = None) -> Optional[str]:
     if yaml_path is None:
         yaml_path = find_variables_yaml()
 
+    raw = yaml_path.read_bytes()
+
+    # Stop at the default scalar; only build the whole document if that fails
     try:
-        with open(yaml_path, 'r') as f:
-            data = yaml.safe_load(f)
+        resolved, version = _scan_scalar(raw, ('variables', 'pkg_version', 'default'))
+        if resolved:
+            return version
+
+        data = yaml.load(raw, Loader=_Loader)
     except yaml.YAMLError as e:
         raise YAMLUpdateError(f"Failed to parse YAML file {yaml_path}: {e}")
 
@@ -335,6 +784,10 @@ def update_all_yaml_files(
     if root_dir is None:
         root_dir = Path.cwd()
 
+    # Resolve the version once rather than once per file
+    if target_version is None:
+        target_version = get_project_version(root_dir)
+
     results = []
 
     # Try to update databricks.yml